@@ -6,6 +6,8 @@ Intelligent file organization tool using NVIDIA NIM for content analysis.
 
 import sys
 import argparse
+import asyncio
+import json
 import os
 from pathlib import Path
 from typing import Optional
@@ -24,40 +26,141 @@ try:
 except Exception:
     yaml = None
 
+
+def _emit_lines(lines):
+    """
+    Write pre-built result lines to stdout in one buffered binary call.
+
+    The per-item result loops can emit hundreds of lines; joining them
+    and writing the encoded payload to sys.stdout.buffer once skips the
+    text-codec step and the TextIOWrapper lock acquisition that every
+    individual print would pay.
+    """
+    if not lines:
+        return
+    sys.stdout.flush()
+    sys.stdout.buffer.write(('\n'.join(lines) + '\n').encode('utf-8', 'ignore'))
+    sys.stdout.buffer.flush()
+
 from pathlib import Path as _Path
+import functools
 
-def _load_nim_models_from_config() -> dict:
-    """Best-effort load of model IDs from config.yaml in CWD."""
-    models = {}
+@functools.lru_cache(maxsize=1)
+def _load_config() -> dict:
+    """Parse config.yaml from CWD once and cache the result."""
     try:
         cfg_path = _Path.cwd() / 'config.yaml'
         if yaml and cfg_path.exists():
             with open(cfg_path, 'r', encoding='utf-8') as f:
-                cfg = yaml.safe_load(f) or {}
-            models = (cfg.get('nvidia_nim', {}) or {}).get('models', {}) or {}
+                # Prefer the libyaml C loader when PyYAML was built with it
+                loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+                return yaml.load(f, Loader=loader) or {}
     except Exception:
-        models = {}
-    return models
+        pass
+    return {}
+
+def _load_nim_models_from_config() -> dict:
+    """Best-effort load of model IDs from config.yaml in CWD."""
+    return (_load_config().get('nvidia_nim', {}) or {}).get('models', {}) or {}
 
 def _load_similarity_from_config(default_value: float = 0.5) -> float:
     try:
-        cfg_path = _Path.cwd() / 'config.yaml'
-        if yaml and cfg_path.exists():
-            with open(cfg_path, 'r', encoding='utf-8') as f:
-                cfg = yaml.safe_load(f) or {}
-            return float(((cfg.get('ai_analysis', {}) or {}).get('similarity_threshold', default_value)))
+        return float((_load_config().get('ai_analysis', {}) or {}).get('similarity_threshold', default_value))
+    except Exception:
+        return default_value
+import importlib.util
+
+# Heavy modules (smart_file_organizer pulls in torch/sentence-transformers)
+# are imported lazily inside the functions that need them, so --help,
+# --version and argument errors never pay the model-stack import cost.
+SMART_ORGANIZER_AVAILABLE = importlib.util.find_spec("smart_file_organizer") is not None
+
+
+_NIM_PROBE_TTL_SECONDS = 300
+
+
+def _cached_nim_probe(nim_client) -> bool:
+    """
+    Probe NIM endpoint reachability, caching the verdict on disk.
+
+    The probe itself is bounded by a 1.5 s timeout so a dead endpoint
+    fails fast instead of hanging on DNS/TLS; repeated runs within the
+    TTL skip the network round-trip entirely. Only the base URL (never
+    the API key) is written to the cache file.
+    """
+    cache_path = _Path.home() / '.cache' / 'smart-file-organizer' / 'nim_probe.json'
+    key = nim_client.base_url
+    try:
+        if cache_path.exists() and time.time() - cache_path.stat().st_mtime < _NIM_PROBE_TTL_SECONDS:
+            cached = json.loads(cache_path.read_text())
+            if cached.get('base_url') == key:
+                return bool(cached.get('ok'))
     except Exception:
         pass
-    return default_value
-from nim_integration import NIMClient
-from nim_integration.embeddings import LocalEmbeddingBackend, NIMEmbeddingBackend
+    ok = nim_client.is_available(timeout=1.5)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps({'base_url': key, 'ok': ok}))
+    except OSError:
+        pass
+    return ok
 
-# Import new smart semantic organizer
-try:
+
+@functools.lru_cache(maxsize=4)
+def _get_embedding_backend(selected_backend: str, model_name: str,
+                           api_key: Optional[str], base_url: Optional[str]):
+    """
+    Build an embedding backend once per configuration and reuse it.
+
+    Local backends load SentenceTransformer weights (seconds per load),
+    so repeated organize_files_smart calls must not reconstruct them.
+    Clear with _get_embedding_backend.cache_clear() after config changes.
+    """
+    from nim_integration import NIMClient
+    from nim_integration.embeddings import LocalEmbeddingBackend, NIMEmbeddingBackend
+
+    if selected_backend == "nim":
+        nim_client = NIMClient(base_url=base_url, api_key=api_key)
+        if not nim_client.is_configured():
+            raise RuntimeError(
+                "NVIDIA NIM not configured. Set NVIDIA_API_KEY and optionally NVIDIA_NIM_BASE_URL."
+            )
+        if not _cached_nim_probe(nim_client):
+            raise RuntimeError(
+                f"NVIDIA NIM endpoint not reachable: {nim_client.base_url}"
+            )
+        # If using e5-style embeddings, set input_type='passage' for documents
+        return NIMEmbeddingBackend(model_name, nim_client,
+                                   force_e5=("e5" in model_name), input_type="passage")
+    return LocalEmbeddingBackend(model_name)
+
+
+# Organizers reused across calls, keyed by their full configuration
+_ORGANIZER_CACHE = {}
+
+
+def _get_organizer(embedding_backend, sim_threshold: float, base_output_dir: str,
+                   multimodal: bool, vision_model: Optional[str],
+                   api_key: Optional[str], base_url: Optional[str]) -> 'SmartFileOrganizer':
+    """Reuse a SmartFileOrganizer (and its warm analyzer) per configuration"""
     from smart_file_organizer import SmartFileOrganizer
-    SMART_ORGANIZER_AVAILABLE = True
-except ImportError:
-    SMART_ORGANIZER_AVAILABLE = False
+
+    key = (id(embedding_backend), sim_threshold, base_output_dir,
+           multimodal, vision_model, api_key, base_url)
+    organizer = _ORGANIZER_CACHE.get(key)
+    if organizer is None:
+        organizer = SmartFileOrganizer(
+            similarity_threshold=sim_threshold,
+            base_output_dir=base_output_dir,
+            use_embeddings=True,
+            embedding_backend=embedding_backend,
+            enable_multimodal=multimodal,
+            vision_model=vision_model,
+            nim_api_key=api_key,
+            nim_base_url=base_url,
+        )
+        _ORGANIZER_CACHE[key] = organizer
+    return organizer
 
 
 def setup_environment():
@@ -98,41 +201,31 @@ async def organize_files_smart(source_path: str, destination_path: Optional[str]
         print(" DRY RUN MODE - No files will be moved")
     
     try:
-        # Initialize smart organizer
-        # Build embedding backend
-        embedding_backend = None
+        # Initialize smart organizer, reusing cached backend/organizer state
         selected_backend = (backend or "local").lower()
-        model_name = embed_model
         if selected_backend == "nim":
-            model_name = model_name or "nvidia/nv-embed-v1"
-            nim_client = NIMClient(base_url=base_url, api_key=api_key)
-            if not nim_client.is_configured():
-                print(" NVIDIA NIM not configured. Set NVIDIA_API_KEY and optionally NVIDIA_NIM_BASE_URL.")
-                sys.exit(1)
-            try:
-                # If using e5-style embeddings, set input_type='passage' for documents
-                embedding_backend = NIMEmbeddingBackend(model_name, nim_client, force_e5=("e5" in model_name), input_type="passage")
-                print(f" Using NIM embeddings: {model_name}")
-            except Exception as e:
-                print(f" Failed to initialize NIM backend: {e}")
-                sys.exit(1)
+            model_name = embed_model or "nvidia/nv-embed-v1"
         else:
-            model_name = model_name or "all-MiniLM-L6-v2"
-            embedding_backend = LocalEmbeddingBackend(model_name)
-            print(f" Using local embeddings: {model_name}")
+            model_name = embed_model or "all-MiniLM-L6-v2"
+
+        try:
+            embedding_backend = _get_embedding_backend(selected_backend, model_name, api_key, base_url)
+            print(f" Using {'NIM' if selected_backend == 'nim' else 'local'} embeddings: {model_name}")
+        except Exception as e:
+            print(f" Failed to initialize {selected_backend} backend: {e}")
+            sys.exit(1)
 
         sim_threshold = _load_similarity_from_config(0.5)
-        organizer = SmartFileOrganizer(
-            similarity_threshold=sim_threshold,
-            base_output_dir=destination_path or "Smart_Organized_Files",
-            use_embeddings=True,
-            embedding_backend=embedding_backend,
-            enable_multimodal=multimodal,
-            vision_model=vision_model,
-            nim_api_key=api_key,
-            nim_base_url=base_url,
+        organizer = _get_organizer(
+            embedding_backend,
+            sim_threshold,
+            destination_path or "Smart_Organized_Files",
+            multimodal,
+            vision_model,
+            api_key,
+            base_url,
         )
-        
+
         if qa:
             result = await organizer.semantic_qa([source_path], question=qa, top_k=top_k,
                                                 llm_model=llm_model or "meta/llama3-70b-instruct",
@@ -141,13 +234,12 @@ async def organize_files_smart(source_path: str, destination_path: Optional[str]
             print(result.get('answer', ''))
             if result.get('top_context'):
                 print("\nContext files:")
-                for p in result['top_context']:
-                    print(f" - {p}")
+                _emit_lines([f" - {p}" for p in result['top_context']])
         elif query:
             result = await organizer.semantic_search([source_path], query=query, top_k=top_k)
             print("\n Semantic search results:")
-            for item in result.get('results', []):
-                print(f"   {item['score']:.4f}  {item['path']}")
+            _emit_lines([f"   {item['score']:.4f}  {item['path']}"
+                         for item in result.get('results', [])])
         else:
             # Execute smart organization
             result = await organizer.organize_files(
@@ -173,12 +265,12 @@ async def organize_files_smart(source_path: str, destination_path: Optional[str]
             print(f"   Undo file: {result['undo_file']}")
         
         print(f"\n PROJECT BREAKDOWN:")
-        for project_type, count in result['project_breakdown']['by_type'].items():
-            print(f"   {project_type}: {count} projects")
-            
+        _emit_lines([f"   {project_type}: {count} projects"
+                     for project_type, count in result['project_breakdown']['by_type'].items()])
+
         print(f"\n DETECTED PROJECTS:")
-        for project in result['detected_projects']:
-            print(f"   • {project['name']} ({project['file_count']} files, confidence: {project['confidence']})")
+        _emit_lines([f"   • {project['name']} ({project['file_count']} files, confidence: {project['confidence']})"
+                     for project in result['detected_projects']])
         
         return result
         
@@ -217,8 +309,16 @@ def organize_files(source_path: str, destination_path: Optional[str] = None, dry
     
     if use_smart and SMART_ORGANIZER_AVAILABLE:
         # Use new smart semantic organization
-        import asyncio
-        return asyncio.run(organize_files_smart(source_path, destination_path, dry_run, backend=backend, embed_model=embed_model, query=query, top_k=top_k, api_key=api_key, base_url=base_url, qa=qa, llm_model=llm_model, multimodal=multimodal, vision_model=vision_model))
+        coro = organize_files_smart(source_path, destination_path, dry_run, backend=backend, embed_model=embed_model, query=query, top_k=top_k, api_key=api_key, base_url=base_url, qa=qa, llm_model=llm_model, multimodal=multimodal, vision_model=vision_model)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # One-shot CLI path: no loop yet, run to completion here
+            return asyncio.run(coro)
+        # Called from async/library context: hand the coroutine back so the
+        # caller's loop (and any warm client state) is reused instead of
+        # spinning up a fresh loop per invocation
+        return coro
     else:
         # Use basic organization
         if use_smart and not SMART_ORGANIZER_AVAILABLE:
@@ -4,8 +4,12 @@ Project Detector - Advanced project relationship detection
 Builds on semantic analysis to create intelligent project groupings.
 """
 
+import asyncio
+import functools
 import os
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Set, Optional, Any, Tuple
 from pathlib import Path
 from dataclasses import dataclass
@@ -18,11 +22,117 @@ try:
 except Exception:
     yaml = None
 
-from semantic_analyzer import SemanticAnalyzer, FileSignature, ProjectCluster
+from semantic_analyzer import SemanticAnalyzer, FileSignature, ProjectCluster, get_shared_analyzer
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Compiled once at import; _sanitize_folder_name runs per artist/album/
+# category name and recompiling the patterns each call is pure overhead
+_INVALID_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_MULTI_UNDERSCORE_RE = re.compile(r'_+')
+
+# Keyword buckets for classification. frozensets let each check be one
+# C-level intersection against the file's keyword set instead of a
+# Python-level any() loop over membership tests.
+_KW_SCREENSHOT = frozenset({'screenshot', 'screen', 'capture'})
+_KW_PHOTO = frozenset({'photo', 'pic', 'picture'})
+_KW_GRAPHIC = frozenset({'art', 'design', 'graphic'})
+
+# Document categories in priority order, inverted into a token ->
+# priority table: classification intersects a file's keywords against
+# all document tokens at once and picks the highest-priority hit,
+# instead of testing five buckets one by one
+_DOC_CATEGORIES = ('Drafts', 'Final_Documents', 'Research_Materials', 'Notes', 'Reports')
+_TOKEN_TO_DOC_PRIORITY = {
+    token: priority
+    for priority, tokens in enumerate((
+        ('draft', 'rough', 'outline'),
+        ('final', 'submission', 'complete'),
+        ('research', 'source', 'reference'),
+        ('note', 'notes', 'memo'),
+        ('report', 'analysis', 'summary'),
+    ))
+    for token in tokens
+}
+_ALL_DOC_TOKENS = frozenset(_TOKEN_TO_DOC_PRIORITY)
+
+# Folder names per file type, with project-context overrides keyed by
+# (project_type, file_type). Built once at import so _get_type_folder_name
+# is two dict lookups instead of a rebuilt dict literal plus an if-ladder
+_TYPE_MAPPING = {
+    'audio': 'Audio',
+    'image': 'Images',
+    'video': 'Videos',
+    'document': 'Documents',
+    'spreadsheet': 'Spreadsheets',
+    'presentation': 'Presentations',
+    'archive': 'Archives'
+}
+_CONTEXT_OVERRIDE = {
+    ('music', 'audio'): 'Songs',
+    ('music', 'image'): 'Album_Art',
+    ('music', 'document'): 'Lyrics_Notes',
+    ('academic', 'document'): 'Papers_Documents',
+    ('academic', 'image'): 'Figures_Images',
+    ('photos', 'image'): 'Photos',
+    ('photos', 'video'): 'Videos'
+}
+
+# Signature extraction is fanned out over a shared worker pool in chunks
+# of this many paths; below one chunk the pool is pure overhead
+_SIGNATURE_CHUNK = 256
+
+# Shared lazily-created pool: metadata extraction is I/O-bound with
+# C-extension parsing (mutagen/PIL/PyPDF2) that releases the GIL
+_signature_pool: Optional[ThreadPoolExecutor] = None
+_signature_pool_lock = threading.Lock()
+
+
+def _get_signature_pool() -> ThreadPoolExecutor:
+    global _signature_pool
+    if _signature_pool is None:
+        with _signature_pool_lock:
+            if _signature_pool is None:
+                _signature_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+    return _signature_pool
+
+
+# Date keys are built with plain integer formatting instead of strftime
+# (no format parsing or locale machinery), and memoized because bursts
+# of files routinely share the same creation date
+@functools.lru_cache(maxsize=None)
+def _month_key(year: int, month: int) -> str:
+    return f"{year}_{month:02d}"
+
+
+@functools.lru_cache(maxsize=None)
+def _day_key(year: int, month: int, day: int) -> str:
+    return f"{year}_{month:02d}_{day:02d}"
+
+
+@functools.lru_cache(maxsize=1)
+def _load_min_files_for_subfolder() -> int:
+    """Read organization.min_files_for_subfolder from config.yaml once per process.
+
+    The config file never changes mid-run, so the parsed value is cached;
+    defaults to 3 when config.yaml or yaml support is missing.
+    """
+    default_val = 3
+    try:
+        if yaml is not None:
+            cfg_path = _Path.cwd() / 'config.yaml'
+            if cfg_path.exists():
+                with open(cfg_path, 'r', encoding='utf-8') as f:
+                    cfg = yaml.safe_load(f) or {}
+                org = (cfg.get('organization', {}) or {})
+                val = int(org.get('min_files_for_subfolder', default_val))
+                return val if val > 1 else default_val
+    except Exception:
+        pass
+    return default_val
+
+
+@dataclass(slots=True)
 class ProjectStructure:
     """Represents the hierarchical structure of a detected project"""
     project_name: str
@@ -37,8 +147,11 @@ class ProjectDetector:
     
     def __init__(self, semantic_analyzer: Optional[SemanticAnalyzer] = None):
         """Initialize project detector"""
-        self.semantic_analyzer = semantic_analyzer or SemanticAnalyzer()
-        
+        # Default to the process-wide analyzer so repeated detector
+        # construction reuses loaded models and caches
+        self.semantic_analyzer = semantic_analyzer or get_shared_analyzer()
+        self._min_files_subfolder = _load_min_files_for_subfolder()
+
     async def detect_projects(self, file_paths: List[str]) -> List[ProjectStructure]:
         """
         Detect projects from a list of file paths.
@@ -51,7 +164,7 @@ class ProjectDetector:
         """
         # Step 1: Extract file signatures
         logger.info(f"Analyzing {len(file_paths)} files for project detection...")
-        signatures = await self.semantic_analyzer.analyze_file_signatures(file_paths)
+        signatures = await self._analyze_signatures_parallel(file_paths)
         
         if not signatures:
             logger.warning("No valid file signatures extracted")
@@ -75,7 +188,38 @@ class ProjectDetector:
                 project_structures.append(structure)
                 
         return project_structures
-    
+
+    async def _analyze_signatures_parallel(self, file_paths: List[str]) -> List[Any]:
+        """
+        Extract file signatures, fanning large batches out over worker threads.
+
+        Per-file metadata extraction (tag parsing, EXIF, PDF text) is
+        I/O-bound with GIL-releasing C-extension work, so chunks of
+        _SIGNATURE_CHUNK paths run concurrently on the shared pool.
+        Embeddings are then attached in one batched pass to keep the
+        backend's request batching intact.
+        """
+        analyzer = self.semantic_analyzer
+        if len(file_paths) <= _SIGNATURE_CHUNK:
+            return await analyzer.analyze_file_signatures(file_paths)
+
+        chunks = [file_paths[start:start + _SIGNATURE_CHUNK]
+                  for start in range(0, len(file_paths), _SIGNATURE_CHUNK)]
+        loop = asyncio.get_running_loop()
+        pool = _get_signature_pool()
+        results = await asyncio.gather(
+            *[loop.run_in_executor(pool, analyzer.analyze_chunk, chunk) for chunk in chunks]
+        )
+
+        signatures: List[Any] = []
+        embed_texts: List[str] = []
+        for chunk_signatures, chunk_texts in results:
+            signatures.extend(chunk_signatures)
+            embed_texts.extend(chunk_texts)
+
+        analyzer.attach_embeddings(signatures, embed_texts)
+        return signatures
+
     def _create_project_structure(self, cluster: ProjectCluster) -> Optional[ProjectStructure]:
         """Create a hierarchical project structure from a cluster"""
         if not cluster.files:
@@ -112,38 +256,10 @@ class ProjectDetector:
     
     def _get_type_folder_name(self, file_type: str, project_type: str) -> str:
         """Get appropriate folder name for file type within project context"""
-        type_mapping = {
-            'audio': 'Audio',
-            'image': 'Images', 
-            'video': 'Videos',
-            'document': 'Documents',
-            'spreadsheet': 'Spreadsheets',
-            'presentation': 'Presentations',
-            'archive': 'Archives'
-        }
-        
-        base_name = type_mapping.get(file_type, file_type.title())
-        
-        # Context-specific naming
-        if project_type == 'music':
-            if file_type == 'audio':
-                return 'Songs'
-            elif file_type == 'image':
-                return 'Album_Art'
-            elif file_type == 'document':
-                return 'Lyrics_Notes'
-        elif project_type == 'academic':
-            if file_type == 'document':
-                return 'Papers_Documents' 
-            elif file_type == 'image':
-                return 'Figures_Images'
-        elif project_type == 'photos':
-            if file_type == 'image':
-                return 'Photos'
-            elif file_type == 'video':
-                return 'Videos'
-                
-        return base_name
+        override = _CONTEXT_OVERRIDE.get((project_type, file_type))
+        if override is not None:
+            return override
+        return _TYPE_MAPPING.get(file_type) or file_type.title()
     
     def _create_subcategories(self, files: List[FileSignature], 
                             project_type: str) -> Dict[str, List[str]]:
@@ -152,139 +268,144 @@ class ProjectDetector:
             return {}
         
         # Respect minimum size before creating subfolders: place files directly if small
-        min_size = self._min_files_for_subfolder()
+        min_size = self._min_files_subfolder
         if len(files) < min_size:
             return [f.path for f in files]  # Return list to avoid extra folder nesting
             
-        # Special handling for different project types
+        # Special handling for different project types. Builders report
+        # their largest bucket so the flatten check below is O(1)
         if project_type == 'music' and files[0].file_type == 'audio':
-            sub = self._create_audio_subcategories(files)
+            sub, max_bucket = self._create_audio_subcategories(files)
         elif project_type == 'academic' and files[0].file_type == 'document':
-            sub = self._create_document_subcategories(files)
+            sub, max_bucket = self._create_document_subcategories(files)
         elif project_type == 'photos' and files[0].file_type == 'image':
-            sub = self._create_image_subcategories(files)
+            sub, max_bucket = self._create_image_subcategories(files)
         else:
-            sub = self._create_generic_subcategories(files)
+            sub, max_bucket = self._create_generic_subcategories(files)
 
         # If each subcategory contains only one file, avoid deep folders: flatten
-        try:
-            if isinstance(sub, dict):
-                lists = list(sub.values())
-                if lists and all(isinstance(v, list) and len(v) == 1 for v in lists):
-                    return [v[0] for v in lists]
-        except Exception:
-            pass
+        if sub and max_bucket == 1:
+            return [paths[0] for paths in sub.values()]
 
         return sub
     
-    def _create_audio_subcategories(self, files: List[FileSignature]) -> Dict[str, List[str]]:
-        """Create subcategories for audio files"""
-        subcategories = defaultdict(list)
-        
-        # Group by artist if available
-        artists = defaultdict(list)
+    def _create_audio_subcategories(self, files: List[FileSignature]) -> Tuple[Dict[str, List[str]], int]:
+        """Create subcategories for audio files; returns (buckets, max bucket size)"""
+        # Single pass accumulates both groupings; which one is used is
+        # decided afterwards, instead of re-walking the files when the
+        # library turns out to have a single artist
+        artists: Dict[str, List[str]] = {}
+        albums: Dict[str, List[str]] = {}
+        artists_max = albums_max = 0
+
         for file_sig in files:
-            artist = file_sig.metadata.get('artist', '').strip()
-            if artist:
-                artists[artist].append(file_sig.path)
-            else:
-                artists['Unknown_Artist'].append(file_sig.path)
-                
+            metadata = file_sig.metadata
+            artist = metadata.get('artist', '').strip() or 'Unknown_Artist'
+            bucket = artists.setdefault(artist, [])
+            bucket.append(file_sig.path)
+            if len(bucket) > artists_max:
+                artists_max = len(bucket)
+
+            album = metadata.get('album', '').strip()
+            if not album:
+                # Group by creation date
+                d = file_sig.created_date
+                album = f"Created_{_month_key(d.year, d.month)}"
+            bucket = albums.setdefault(album, [])
+            bucket.append(file_sig.path)
+            if len(bucket) > albums_max:
+                albums_max = len(bucket)
+
+        subcategories = {}
         # If multiple artists, use artist-based subcategories
         if len(artists) > 1:
             for artist, paths in artists.items():
                 safe_artist = self._sanitize_folder_name(artist)
                 subcategories[f"By_Artist/{safe_artist}"] = paths
-        else:
-            # Single artist or unknown - group by album or date
-            albums = defaultdict(list)
-            for file_sig in files:
-                album = file_sig.metadata.get('album', '').strip()
-                if album:
-                    albums[album].append(file_sig.path)
-                else:
-                    # Group by creation date
-                    date_key = file_sig.created_date.strftime('%Y_%m')
-                    albums[f"Created_{date_key}"].append(file_sig.path)
-                    
-            for album, paths in albums.items():
-                safe_album = self._sanitize_folder_name(album)
-                subcategories[safe_album] = paths
-                
-        return dict(subcategories)
+            return subcategories, artists_max
+
+        # Single artist or unknown - group by album or date
+        for album, paths in albums.items():
+            safe_album = self._sanitize_folder_name(album)
+            subcategories[safe_album] = paths
+        return subcategories, albums_max
     
-    def _create_document_subcategories(self, files: List[FileSignature]) -> Dict[str, List[str]]:
-        """Create subcategories for document files"""
-        subcategories = defaultdict(list)
-        
+    def _create_document_subcategories(self, files: List[FileSignature]) -> Tuple[Dict[str, List[str]], int]:
+        """Create subcategories for document files; returns (buckets, max bucket size)"""
+        subcategories: Dict[str, List[str]] = {}
+        max_bucket = 0
+
         # Analyze content keywords to determine document types
         for file_sig in files:
             category = self._classify_document_type(file_sig)
-            subcategories[category].append(file_sig.path)
-            
-        return dict(subcategories)
+            bucket = subcategories.setdefault(category, [])
+            bucket.append(file_sig.path)
+            if len(bucket) > max_bucket:
+                max_bucket = len(bucket)
+
+        return subcategories, max_bucket
     
     def _classify_document_type(self, file_sig: FileSignature) -> str:
         """Classify document based on content and name"""
-        keywords = file_sig.content_keywords | file_sig.name_tokens
-        
-        # Check for specific document types
-        if any(word in keywords for word in ['draft', 'rough', 'outline']):
-            return 'Drafts'
-        elif any(word in keywords for word in ['final', 'submission', 'complete']):
-            return 'Final_Documents'
-        elif any(word in keywords for word in ['research', 'source', 'reference']):
-            return 'Research_Materials'
-        elif any(word in keywords for word in ['note', 'notes', 'memo']):
-            return 'Notes'
-        elif any(word in keywords for word in ['report', 'analysis', 'summary']):
-            return 'Reports'
-        else:
+        # One intersection short-circuits the common no-match case; the
+        # priority table then keeps the original bucket precedence
+        matched = file_sig.all_keywords & _ALL_DOC_TOKENS
+        if not matched:
             return 'Documents'
+        return _DOC_CATEGORIES[min(_TOKEN_TO_DOC_PRIORITY[token] for token in matched)]
     
-    def _create_image_subcategories(self, files: List[FileSignature]) -> Dict[str, List[str]]:
-        """Create subcategories for image files"""
-        subcategories = defaultdict(list)
-        
+    def _create_image_subcategories(self, files: List[FileSignature]) -> Tuple[Dict[str, List[str]], int]:
+        """Create subcategories for image files; returns (buckets, max bucket size)"""
+        subcategories: Dict[str, List[str]] = {}
+        max_bucket = 0
+
         # Group by creation date or content type
         for file_sig in files:
-            keywords = file_sig.content_keywords | file_sig.name_tokens
-            
-            if any(word in keywords for word in ['screenshot', 'screen', 'capture']):
-                subcategories['Screenshots'].append(file_sig.path)
-            elif any(word in keywords for word in ['photo', 'pic', 'picture']):
+            keywords = file_sig.all_keywords
+
+            if _KW_SCREENSHOT & keywords:
+                category = 'Screenshots'
+            elif _KW_PHOTO & keywords:
                 # Group photos by date
-                date_key = file_sig.created_date.strftime('%Y_%m_%d')
-                subcategories[f'Photos_{date_key}'].append(file_sig.path)
-            elif any(word in keywords for word in ['art', 'design', 'graphic']):
-                subcategories['Graphics'].append(file_sig.path)
+                d = file_sig.created_date
+                category = f'Photos_{_day_key(d.year, d.month, d.day)}'
+            elif _KW_GRAPHIC & keywords:
+                category = 'Graphics'
             else:
-                subcategories['Images'].append(file_sig.path)
-                
-        return dict(subcategories)
+                category = 'Images'
+
+            bucket = subcategories.setdefault(category, [])
+            bucket.append(file_sig.path)
+            if len(bucket) > max_bucket:
+                max_bucket = len(bucket)
+
+        return subcategories, max_bucket
     
-    def _create_generic_subcategories(self, files: List[FileSignature]) -> Dict[str, List[str]]:
-        """Create generic subcategories based on common patterns"""
-        subcategories = defaultdict(list)
-        
+    def _create_generic_subcategories(self, files: List[FileSignature]) -> Tuple[Dict[str, List[str]], int]:
+        """Create generic subcategories based on common patterns; returns (buckets, max bucket size)"""
         # Group by common keywords or creation time
         if len(files) <= 3:
             # Few files - keep them together
-            subcategories['Files'] = [f.path for f in files]
-        else:
-            # Many files - group by date
-            for file_sig in files:
-                date_key = file_sig.created_date.strftime('%Y_%m')
-                subcategories[f'Created_{date_key}'].append(file_sig.path)
-                
-        return dict(subcategories)
+            return {'Files': [f.path for f in files]}, len(files)
+
+        # Many files - group by date
+        subcategories: Dict[str, List[str]] = {}
+        max_bucket = 0
+        for file_sig in files:
+            d = file_sig.created_date
+            bucket = subcategories.setdefault(f'Created_{_month_key(d.year, d.month)}', [])
+            bucket.append(file_sig.path)
+            if len(bucket) > max_bucket:
+                max_bucket = len(bucket)
+
+        return subcategories, max_bucket
     
     def _sanitize_folder_name(self, name: str) -> str:
         """Sanitize a string to be safe for folder names"""
         # Replace invalid characters
-        safe_name = re.sub(r'[<>:"/\\|?*]', '_', name)
+        safe_name = _INVALID_CHARS_RE.sub('_', name)
         # Remove multiple underscores
-        safe_name = re.sub(r'_+', '_', safe_name)
+        safe_name = _MULTI_UNDERSCORE_RE.sub('_', safe_name)
         # Remove leading/trailing underscores
         safe_name = safe_name.strip('_')
         # Limit length
@@ -297,36 +418,39 @@ class ProjectDetector:
         return safe_name
 
     def _min_files_for_subfolder(self) -> int:
-        """Load minimum files required to create a subfolder from config.yaml; default to 3."""
-        default_val = 3
-        try:
-            if yaml is not None:
-                cfg_path = _Path.cwd() / 'config.yaml'
-                if cfg_path.exists():
-                    with open(cfg_path, 'r', encoding='utf-8') as f:
-                        cfg = yaml.safe_load(f) or {}
-                    org = (cfg.get('organization', {}) or {})
-                    val = int(org.get('min_files_for_subfolder', default_val))
-                    return val if val > 1 else default_val
-        except Exception:
-            pass
-        return default_val
-    
+        """Minimum files required to create a subfolder (cached from config.yaml)."""
+        return self._min_files_subfolder
+
     def get_project_summary(self, projects: List[ProjectStructure]) -> Dict[str, Any]:
         """Generate summary statistics for detected projects"""
         if not projects:
             return {}
-            
-        summary = {
+
+        # One pass over the projects instead of five separate traversals
+        total_files = 0
+        confidence_sum = 0.0
+        project_types: Counter = Counter()
+        small = medium = large = 0
+
+        for p in projects:
+            total_files += p.file_count
+            confidence_sum += p.confidence
+            project_types[p.project_type] += 1
+            if p.file_count <= 5:
+                small += 1
+            elif p.file_count <= 15:
+                medium += 1
+            else:
+                large += 1
+
+        return {
             'total_projects': len(projects),
-            'total_files': sum(p.file_count for p in projects),
-            'project_types': Counter(p.project_type for p in projects),
-            'avg_confidence': sum(p.confidence for p in projects) / len(projects),
+            'total_files': total_files,
+            'project_types': project_types,
+            'avg_confidence': confidence_sum / len(projects),
             'projects_by_size': {
-                'small (2-5 files)': len([p for p in projects if p.file_count <= 5]),
-                'medium (6-15 files)': len([p for p in projects if 6 <= p.file_count <= 15]),
-                'large (16+ files)': len([p for p in projects if p.file_count > 15])
+                'small (2-5 files)': small,
+                'medium (6-15 files)': medium,
+                'large (16+ files)': large
             }
-        }
-        
-        return summary
\ No newline at end of file
+        }
\ No newline at end of file
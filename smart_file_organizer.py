@@ -7,6 +7,8 @@ Implements the innovative cross-format, multi-level organization system.
 import os
 import asyncio
 import logging
+import queue
+import threading
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 import json
@@ -20,6 +22,62 @@ from hierarchy_builder import HierarchyBuilder, OrganizationPlan
 
 logger = logging.getLogger(__name__)
 
+def _scan_tree(root: str, workers: int = 8) -> List[str]:
+    """
+    Collect file paths under root with a work-queue os.scandir walk.
+
+    A shared queue of pending directories keeps every worker busy even
+    when subtree sizes are wildly uneven: a worker that drains a shallow
+    branch immediately pulls the next directory instead of idling until
+    the deepest straggler at its depth finishes. DirEntry type checks
+    come from the directory read itself, so no per-entry stat or Path
+    allocation is needed. Hidden entries (dot-prefixed) are pruned up
+    front, so hidden directory trees are never entered.
+    """
+    dir_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+    dir_queue.put(str(root))
+    collected: List[str] = []
+    collected_lock = threading.Lock()
+
+    def worker():
+        while True:
+            directory = dir_queue.get()
+            if directory is None:
+                dir_queue.task_done()
+                return
+            files = []
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        # Skip hidden entries before any type check so
+                        # dot-directories (.git, .cache, ...) are never
+                        # descended into, let alone scanned
+                        if entry.name.startswith('.'):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            dir_queue.put(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            files.append(entry.path)
+            except OSError:
+                pass
+            if files:
+                with collected_lock:
+                    collected.extend(files)
+            dir_queue.task_done()
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    # join() returns once every queued directory has been scanned; only
+    # then are the sentinels sent so no worker exits while work remains
+    dir_queue.join()
+    for _ in threads:
+        dir_queue.put(None)
+    for thread in threads:
+        thread.join()
+
+    return collected
+
 class SmartFileOrganizer:
     """
     Main class that orchestrates the semantic file organization process.
@@ -159,10 +217,8 @@ class SmartFileOrganizer:
             if path_obj.is_file():
                 all_files.append(str(path_obj))
             elif path_obj.is_dir():
-                # Recursively collect files
-                for file_path in path_obj.rglob('*'):
-                    if file_path.is_file() and not file_path.name.startswith('.'):
-                        all_files.append(str(file_path))
+                # Recursively collect files with the parallel scandir walk
+                all_files.extend(_scan_tree(str(path_obj)))
             else:
                 logger.warning(f"Path does not exist: {source_path}")
                 
@@ -130,17 +130,19 @@ async def test_semantic_analysis():
         ai_file = signatures_with_embeddings[1]   # ai_overview.txt
         recipe_file = signatures_with_embeddings[3]  # cooking_recipe.txt
         
-        # With embeddings
-        embedding_sim_ml_ai = analyzer_with_embeddings._calculate_file_similarity(ml_file, ai_file)
-        embedding_sim_ml_recipe = analyzer_with_embeddings._calculate_file_similarity(ml_file, recipe_file)
-        
-        # Without embeddings
-        traditional_sim_ml_ai = analyzer_traditional._calculate_file_similarity(
-            signatures_traditional[0], signatures_traditional[1]
+        # With embeddings (pairwise scores come from the vectorized matrix)
+        embedding_matrix = analyzer_with_embeddings._calculate_similarity_matrix(
+            [ml_file, ai_file, recipe_file]
         )
-        traditional_sim_ml_recipe = analyzer_traditional._calculate_file_similarity(
-            signatures_traditional[0], signatures_traditional[3]
+        embedding_sim_ml_ai = embedding_matrix[0][1]
+        embedding_sim_ml_recipe = embedding_matrix[0][2]
+
+        # Without embeddings
+        traditional_matrix = analyzer_traditional._calculate_similarity_matrix(
+            [signatures_traditional[0], signatures_traditional[1], signatures_traditional[3]]
         )
+        traditional_sim_ml_ai = traditional_matrix[0][1]
+        traditional_sim_ml_recipe = traditional_matrix[0][2]
         
         print(f"ML ↔ AI similarity:")
         print(f"  With embeddings: {embedding_sim_ml_ai:.3f}")